@@ -1,9 +1,24 @@
+import io
 import time
 from abc import ABC, abstractmethod
 import jwt
 import requests
+import urllib3
 import json
 
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+try:
+    import httpx
+except ImportError:
+    # optional - only needed when http2=True is requested
+    httpx = None
+
+# shared session for the (unauthenticated) token endpoint so that repeated
+# authentications reuse the same TLS connection instead of handshaking each time
+_TOKEN_SESSION = requests.Session()
+_TOKEN_SESSION.mount('https://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
 
 class SFAuthCommon(ABC):
 
@@ -12,12 +27,61 @@ class SFAuthCommon(ABC):
         raise NotImplemented
 
 
+class _BufferedBody(io.BytesIO):
+    # stands in for urllib3's response.raw on the httpx path; the stream has
+    # already been decoded, so decode_content assignments are accepted and ignored
+    decode_content = True
+
+
+class _HTTPXResponse(object):
+
+    def __init__(self, response):
+        self._response = response
+        self.raw = _BufferedBody(response.content)
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+
+class _HTTPXSession(object):
+    """Minimal requests.Session-compatible facade over httpx.Client.
+
+    Exposes just the surface SFClient uses (get/post/patch/delete with
+    params/data/headers/stream keywords) so the HTTP/2 client is a drop-in
+    swap for the pooled requests Session.
+    """
+
+    def __init__(self, headers):
+        self._client = httpx.Client(http2=True, headers=headers,
+                                    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64,
+                                                        keepalive_expiry=60))
+        self.headers = self._client.headers
+
+    def get(self, url, params=None, headers=None, stream=False):
+        return _HTTPXResponse(self._client.get(url, params=params, headers=headers))
+
+    def post(self, url, data=None, headers=None):
+        return self._client.request('POST', url, content=data, headers=headers)
+
+    def patch(self, url, data=None, headers=None):
+        return self._client.request('PATCH', url, content=data, headers=headers)
+
+    def delete(self, url):
+        return self._client.delete(url)
+
+
 class SFAuthenticator(object):
 
-    def __init__(self):
+    # Salesforce session timeout is org-configurable; 2 hours is the default.
+    # Tokens are refreshed shortly before this age is reached.
+    TOKEN_LIFETIME = 2 * 60 * 60
+
+    def __init__(self, http2: bool = False):
         self.access_token = None
         self.service_url = None
         self.client = None
+        self._http2 = http2
+        self._token_expires_at = None
         self._authenticated = False
 
     @property
@@ -28,13 +92,37 @@ class SFAuthenticator(object):
     def authenticated(self, value: bool):
         self._authenticated = value
 
+    def needs_refresh(self) -> bool:
+        """True when the access token is within a minute of its expected expiry."""
+        return self._token_expires_at is not None and time.time() > self._token_expires_at - 60
+
     def construct(self, payload):
         self.access_token = payload['access_token']
         self.service_url = payload['instance_url']
+        self._token_expires_at = time.time() + self.TOKEN_LIFETIME
+        headers = {'Authorization': 'OAuth ' + self.access_token,
+                   'Content-Type': 'application/json; charset=UTF-8',
+                   'Accept-Encoding': 'gzip, compress, deflate', 'Accept-Charset': 'utf-8'}
+        if self._http2:
+            # multiplex concurrent requests over a single TLS connection
+            if httpx is None:
+                raise AuthException('http2 support requires the httpx package to be installed')
+            self.client = _HTTPXSession(headers)
+            return
         self.client = requests.Session()
-        self.client.headers.update({'Authorization': 'OAuth ' + self.access_token,
-                                    'Content-Type': 'application/json; charset=UTF-8',
-                                    'Accept-Encoding': 'gzip, compress, deflate', 'Accept-Charset': 'utf-8'})
+        # size the pool for concurrent use and retry throttled/transient failures
+        # with exponential backoff, honoring any Retry-After the instance sends back
+        retry_args = dict(total=8, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                          allowed_methods=frozenset(['GET', 'POST', 'PATCH']),
+                          respect_retry_after_header=True)
+        try:
+            retries = urllib3.Retry(backoff_jitter=0.3, **retry_args)
+        except TypeError:
+            # urllib3 1.x has no backoff_jitter
+            retries = urllib3.Retry(**retry_args)
+        self.client.mount('https://', requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=64,
+                                                                    max_retries=retries))
+        self.client.headers.update(headers)
 
 
 class AuthException(Exception):
@@ -47,11 +135,15 @@ class AuthException(Exception):
 
 class OAuthJWT(SFAuthenticator, SFAuthCommon):
 
-    def __init__(self, username: str, consumer_key: str, cert_key: str, server_url='https://test.salesforce.com'):
-        SFAuthenticator.__init__(self)
+    def __init__(self, username: str, consumer_key: str, cert_key: str, server_url='https://test.salesforce.com',
+                 http2: bool = False):
+        SFAuthenticator.__init__(self, http2=http2)
         self.username = username
         self.consumer_key = consumer_key
-        self.cert_key = cert_key
+        # parse the PEM once here - loading the key is far more expensive than signing with it,
+        # so repeated authenticate() calls should not pay for it every time
+        self._signing_key = load_pem_private_key(cert_key.encode() if isinstance(cert_key, str) else cert_key,
+                                                 password=None)
         self.server_url = server_url
 
     def authenticate(self):
@@ -62,11 +154,11 @@ class OAuthJWT(SFAuthenticator, SFAuthCommon):
                        'aud': self.server_url,
                        'exp': int(time.time()) + 60
                        }
-            package = jwt.encode(payload, self.cert_key, algorithm='RS256')
-            rsp = requests.post(self.server_url + '/services/oauth2/token',
-                                data={'grant_type': 'urn:ietf:params:oauth:grant-type:jwt-bearer',
-                                      'assertion': package},
-                                headers={'content-type': 'application/x-www-form-urlencoded'})
+            package = jwt.encode(payload, self._signing_key, algorithm='RS256')
+            rsp = _TOKEN_SESSION.post(self.server_url + '/services/oauth2/token',
+                                      data={'grant_type': 'urn:ietf:params:oauth:grant-type:jwt-bearer',
+                                            'assertion': package},
+                                      headers={'content-type': 'application/x-www-form-urlencoded'})
             payload = json.loads(rsp.text)
             if 'error' in payload:
                 raise Exception(payload['error_description'])
@@ -78,15 +170,10 @@ class OAuthJWT(SFAuthenticator, SFAuthCommon):
 
 
 class OAuthPassword(SFAuthenticator):
-    _username = None
-    _password = None
-    _consumer_key = None
-    _consumer_secret = None
-    _server_url = None
 
     def __init__(self, username: str, password: str, consumer_key: str, consumer_secret: str,
-                 server_url='https://test.salesforce.com'):
-        SFAuthenticator.__init__(self)
+                 server_url='https://test.salesforce.com', http2: bool = False):
+        SFAuthenticator.__init__(self, http2=http2)
         self._username = username
         self._password = password
         self._consumer_key = consumer_key
@@ -101,8 +188,8 @@ class OAuthPassword(SFAuthenticator):
                        'client_id': self._consumer_key,
                        'client_secret': self._consumer_secret
                        }
-            rsp = requests.post(self._server_url + '/services/oauth2/token', data=payload,
-                                headers={'content-type': 'application/x-www-form-urlencoded'})
+            rsp = _TOKEN_SESSION.post(self._server_url + '/services/oauth2/token', data=payload,
+                                      headers={'content-type': 'application/x-www-form-urlencoded'})
             payload = json.loads(rsp.text)
             if 'error' in payload:
                 raise Exception(payload['error_description'])
@@ -1,13 +1,35 @@
+import asyncio
+import csv
+import io
 import logging
-import json
-import operator
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Generator, Optional
 
-from fastcache import lru_cache
+import ijson
+import orjson
+from ijson.common import ObjectBuilder
 
 from pysforce.auth import SFAuthenticator
 from pysforce import SF_API_VERSION as _API_VERSION
 
+try:
+    import aiohttp
+except ImportError:
+    # optional - only needed for the async query API
+    aiohttp = None
+
+try:
+    import pyarrow.json as _pyarrow_json
+except ImportError:
+    # optional - only needed for query_arrow
+    _pyarrow_json = None
+
+
+_LIMIT_CLAUSE = re.compile(r'\blimit\s+\d+\b', re.IGNORECASE)
+_OFFSET_CLAUSE = re.compile(r'\boffset\s+\d+\b', re.IGNORECASE)
+
 
 class SFError(Exception):
     def __init__(self, value):
@@ -17,18 +39,47 @@ class SFError(Exception):
         return repr(self.value)
 
 
-def managed(fn):
-    def _inner(self, *args, **kwargs):
-        try:
-            return fn(self, *args, **kwargs)
-        except Exception as ex:
-            # reauthenticate and try again
-            print("Exception caught, attempting new authentication: " + str(ex))
-            self._auth.authenticate()
-            if not self._auth.authenticated:
-                raise ex
-            return fn(self, *args, **kwargs)
-    return _inner
+class FieldMeta:
+    """Slim view of one field from an sobject describe result.
+
+    A describe returns 40+ keys per field but nearly every caller touches only
+    a handful of them. Keeping those in __slots__ makes the cached field lists
+    several times smaller than a dict per field; the complete describe dict
+    remains available as .raw for anything not promoted to a slot.
+    """
+    __slots__ = ('name', 'type', 'length', 'nillable', 'referenceTo', 'raw')
+
+    def __init__(self, raw: Dict):
+        self.name = raw['name']
+        self.type = raw['type']
+        self.length = raw.get('length', 0)
+        self.nillable = raw.get('nillable', False)
+        self.referenceTo = tuple(raw.get('referenceTo') or ())
+        self.raw = raw
+
+    def __repr__(self):
+        return f'FieldMeta(name={self.name!r}, type={self.type!r})'
+
+
+def _iter_query_page(stream, state: Dict) -> Generator:
+    """Incrementally parse one page of query results from a byte stream.
+
+    Yields each member of the top-level 'records' array as it is parsed,
+    without waiting for the rest of the page to arrive. Top-level scalars
+    such as 'nextRecordsUrl' are recorded in state as they are seen.
+    """
+    builder = None
+    for prefix, event, value in ijson.parse(stream):
+        if builder is not None:
+            builder.event(event, value)
+            if event == 'end_map' and prefix == 'records.item':
+                yield builder.value
+                builder = None
+        elif prefix == 'records.item' and event == 'start_map':
+            builder = ObjectBuilder()
+            builder.event(event, value)
+        elif prefix and event in ('string', 'number', 'boolean', 'null') and '.' not in prefix:
+            state[prefix] = value
 
 
 class SFClient:
@@ -38,17 +89,41 @@ class SFClient:
         if not auth.authenticated:
             raise Exception('not authenticated')
         self._auth = auth
+        # pre-built URL roots - every request needs them and they never change
+        self._base_url = f'{auth.service_url}/services/data/v{_API_VERSION}'
+        self._query_url = self._base_url + '/query/'
+        # per-instance metadata caches - describe results rarely change within a session
+        self._schema_cache = {}
+        self._field_list_cache = {}
+        self._field_map_cache = {}
+        self._sobjects_cache = None
 
     @property
     def client(self):
         return self._auth.client
 
+    def _ensure_token(self):
+        # proactively re-authenticate shortly before the access token expires
+        # rather than burning a failed request to find out it already has
+        if self._auth.needs_refresh():
+            self._auth.authenticate()
+
     def close(self):
         self._auth = None
 
     ##
     # Metadata methods
     ##
+    def clear_caches(self):
+        """Discard all cached metadata so the next access re-describes.
+
+        Useful in long-lived processes after a deploy changes sobject shapes.
+        """
+        self._schema_cache.clear()
+        self._field_list_cache.clear()
+        self._field_map_cache.clear()
+        self._sobjects_cache = None
+
     def sobject_schema(self, sobject_name) -> Dict:
         """Returns detailed attributes about an sobject
 
@@ -61,8 +136,10 @@ class SFClient:
         -------
         A dictionary representing all sobject attributes. (see Salesforce metadata docs for more):
         """
-        sobject_doc = self._http_get('sobjects/{}/describe'.format(sobject_name), {})
-        return sobject_doc
+        key = sobject_name.lower()
+        if key not in self._schema_cache:
+            self._schema_cache[key] = self._http_get('sobjects/{}/describe'.format(sobject_name), {})
+        return self._schema_cache[key]
 
     def sobjects(self) -> List[Dict]:
         """Returns a list of available sobjects and minimal attributes for each
@@ -71,12 +148,12 @@ class SFClient:
         -------
         A list of dictionaries representing sobject attributes. (see Salesforce metadata docs for more):
         """
-        response = self._http_get('sobjects/', {})
-        sobject_list = response['sobjects']
-        return sobject_list
+        if self._sobjects_cache is None:
+            response = self._http_get('sobjects/', {})
+            self._sobjects_cache = response['sobjects']
+        return self._sobjects_cache
 
-    @lru_cache(maxsize=10, typed=False)
-    def sobject_field_list(self, sobject_name: str) -> [Dict]:
+    def sobject_field_list(self, sobject_name: str) -> List[FieldMeta]:
         """Returns the list of field definitions for a given sobject
 
         Parameters
@@ -86,75 +163,55 @@ class SFClient:
 
         Returns
         -------
-        A list of dictionaries representing all field attributes.  Each dictionary contains the following
-        fields (see Salesforce metadata docs for more):
-
-        Ex:
-          {
-            "autoNumber": false,
-            "byteLength": 18,
-            "calculated": false,
-            "calculatedFormula": null,
-            "cascadeDelete": false,
-            "caseSensitive": false,
-            "controllerName": null,
-            "createable": true,
-            "custom": false,
-            "defaultValue": null,
-            "defaultValueFormula": null,
-            "defaultedOnCreate": true,
-            "dependentPicklist": false,
-            "deprecatedAndHidden": false,
-            "digits": 0,
-            "displayLocationInDecimal": false,
-            "encrypted": false,
-            "externalId": false,
-            "extraTypeInfo": null,
-            "filterable": true,
-            "filteredLookupInfo": null,
-            "groupable": true,
-            "highScaleNumber": false,
-            "htmlFormatted": false,
-            "idLookup": false,
-            "inlineHelpText": null,
-            "label": "Created By ID",
-            "length": 18,
-            "mask": null,
-            "maskType": null,
-            "name": "CreatedById",
-            "nameField": false,
-            "namePointing": false,
-            "nillable": false,
-            "permissionable": false,
-            "picklistValues": [],
-            "precision": 0,
-            "queryByDistance": false,
-            "referenceTargetField": null,
-            "referenceTo": [
-              "User"
-            ],
-            "relationshipName": "CreatedBy",
-            "relationshipOrder": null,
-            "restrictedDelete": false,
-            "restrictedPicklist": false,
-            "scale": 0,
-            "soapType": "tns:ID",
-            "sortable": true,
-            "type": "reference",
-            "unique": false,
-            "updateable": false,
-            "writeRequiresMasterRead": false
-          }
-
+        A list of FieldMeta objects, one per field, in describe order. The
+        commonly used attributes (name, type, length, nillable, referenceTo)
+        are available directly; the complete describe dictionary for a field
+        is available as its .raw attribute. (see Salesforce metadata docs for more):
         """
-        response = self._http_get('sobjects/%s/describe/' % (sobject_name.lower(),), {})
-        fieldlist = response['fields']
-        fieldlist.sort(key=operator.itemgetter('name'))
+        key = sobject_name.lower()
+        cached = self._field_list_cache.get(key)
+        if cached is not None:
+            return cached
+        response = self._http_get('sobjects/%s/describe/' % (key,), {})
+        fieldlist = [FieldMeta(f) for f in response['fields']]
+        self._field_list_cache[key] = fieldlist
         return fieldlist
 
+    def prefetch_schemas(self, sobject_names: List[str], max_workers: int = 16):
+        """Warm the field-list cache for several sobjects concurrently.
+
+        Each describe is an independent round-trip, so fetching them serially
+        costs one network RTT per sobject. Dispatching them across a thread
+        pool overlaps the waits; subsequent sobject_field_list /
+        sobject_field_map calls for these names are then served from cache.
+
+        :param sobject_names: names of the sobjects to describe
+        :param max_workers: maximum describes in flight at once
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self.sobject_field_list, sobject_names))
+
+    def sobject_field_list_sorted(self, sobject_name: str) -> List[FieldMeta]:
+        """Returns sobject_field_list ordered by field name, for display use.
+
+        Sorting was dropped from the cached path since no internal consumer
+        needs it; this keeps an alphabetical view available without paying
+        for it on every describe. The names are extracted once up front so
+        the sort compares plain strings instead of dispatching into each
+        FieldMeta per comparison.
+        """
+        fieldlist = self.sobject_field_list(sobject_name)
+        names = [f.name for f in fieldlist]
+        order = sorted(range(len(fieldlist)), key=names.__getitem__)
+        return [fieldlist[i] for i in order]
+
     def sobject_field_map(self, sobject_name: str) -> Dict:
-        thelist = self.sobject_field_list(sobject_name.lower())
-        return dict((f['name'].lower(), f) for f in thelist)
+        key = sobject_name.lower()
+        fmap = self._field_map_cache.get(key)
+        if fmap is None:
+            fmap = {f.name.lower(): f for f in self.sobject_field_list(key)}
+            self._field_map_cache[key] = fmap
+        return fmap
 
     ##
     # Data methods
@@ -167,13 +224,12 @@ class SFClient:
         :param field_list: optional, list of fields to return. If omitted, all fields are returned.
         :return: found record, or None
         """
-        if field_list is None:
-            fmap = self.sobject_field_map(sobject_name)
-            field_list = fmap.keys()
-        fieldstring = ','.join(field_list)
         url = 'sobjects/{0}/{1}'.format(sobject_name, recid)
-        result = self._http_get(url, {'fields': fieldstring})
-        return result
+        if field_list is None:
+            # the REST resource returns all fields by default, so there is no
+            # need to describe the sobject just to enumerate them in the URL
+            return self._http_get(url, {})
+        return self._http_get(url, {'fields': ','.join(field_list)})
 
     def insert_record(self, sobject_name: str, user_params: Dict) -> str:
         """
@@ -183,9 +239,8 @@ class SFClient:
         :param user_params: Dictionary of fields for the new record
         :return: recordId of the new record, or None if failed
         """
-        fullurl = f'{self._auth.service_url}/services/data/v{_API_VERSION}/sobjects/{sobject_name}/'
-        data = self._http_post(fullurl, user_params)
-        return data['id'] if data else None
+        fullurl = f'{self._base_url}/sobjects/{sobject_name}/'
+        return (self._http_post(fullurl, user_params) or {}).get('id')
 
     def insert_records(self, sobject_type, sobjects: List[Dict], all_or_none=False) -> List[Dict]:
         """
@@ -218,16 +273,27 @@ class SFClient:
         if len(sobject_type) != len(sobjects):
             raise ValueError("Number of sobject types must match number of sobject records")
 
-        fullurl = f'{self._auth.service_url}/services/data/v{_API_VERSION}/composite/sobjects'
+        fullurl = self._base_url + '/composite/sobjects'
+        # tag each record in place instead of copying it - for a full 200-record
+        # batch that is 200 dict allocations and rehashes avoided. The
+        # 'attributes' entry is left on the caller's dicts.
         records = []
-        payload = {"allOrNone": all_or_none, "records": records}
         for stype, rec in zip(sobject_type, sobjects):
-            records.append({"attributes": {"type": stype}, **rec})
-        result = self._http_post(fullurl, payload)
+            rec.setdefault('attributes', {'type': stype})
+            records.append(rec)
+        result = self._http_post(fullurl, {"allOrNone": all_or_none, "records": records})
         return result
 
     def update_record(self, sobject_name: str, recid: str, user_params: Dict):
-        self._http_patch(sobject_name, recid, user_params)
+        """
+        Update a single sobject record
+
+        :param sobject_name: Name of the sobject (table)
+        :param recid: unique recordid for the row to update
+        :param user_params: Dictionary of changed fields
+        """
+        fullurl = f'{self._base_url}/sobjects/{sobject_name}/{recid}'
+        self._http_patch(fullurl, user_params)
 
     def update_records(self, sobject_type, sobjects: List[Dict], all_or_none=False) -> List[Dict]:
         """
@@ -260,65 +326,268 @@ class SFClient:
         if len(sobject_type) != len(sobjects):
             raise ValueError("Number of sobject types must match number of sobject records")
 
-        fullurl = f'{self._auth.service_url}/services/data/v{_API_VERSION}/composite/sobjects'
+        fullurl = self._base_url + '/composite/sobjects'
+        # tagged in place, as in insert_records
         records = []
-        payload = {"allOrNone": all_or_none, "records": records}
         for stype, rec in zip(sobject_type, sobjects):
-            records.append({"attributes": {"type": stype}, **rec})
-        result = self._http_patch(fullurl, payload)
+            rec.setdefault('attributes', {'type': stype})
+            records.append(rec)
+        result = self._http_patch(fullurl, {"allOrNone": all_or_none, "records": records})
         return result
 
     def fetch_records(self, sobject_type: str, recordidlist: List[str], fieldnames: List[str]) -> List[Dict]:
-        fullurl = f'{self._auth.service_url}/services/data/v{_API_VERSION}/composite/sobjects/{sobject_type}'
+        fullurl = f'{self._base_url}/composite/sobjects/{sobject_type}'
         payload = {"ids": recordidlist, "fields": fieldnames}
         result = self._http_post(fullurl, payload)
-        js = json.loads(result.text)
-        for item in js:
+        for item in result:
             del item["attributes"]
-        return js
+        return result
+
+    async def afetch_records(self, sobject_type: str, recordidlist: List[str], fieldnames: List[str],
+                             max_concurrency: int = 10) -> List[Dict]:
+        """
+        Async version of fetch_records for id lists of any size.
+
+        Splits the ids into 2000-record batches (the composite endpoint limit)
+        and retrieves the batches concurrently, so N batches take roughly the
+        time of the slowest one rather than their sum. Concurrency is capped
+        to stay within Salesforce API limits. Requires the optional aiohttp
+        package.
+
+        :param sobject_type: name of the sobject (table)
+        :param recordidlist: record ids to fetch, any number
+        :param fieldnames: list of fields to return
+        :param max_concurrency: maximum batches in flight at once
+        :return: list of found records, in the order the ids were given
+        """
+        if aiohttp is None:
+            raise SFError('afetch_records requires the aiohttp package to be installed')
+        fullurl = f'{self._base_url}/composite/sobjects/{sobject_type}'
+        headers = {'Authorization': 'OAuth ' + self._auth.access_token,
+                   'Content-Type': 'application/json; charset=UTF-8'}
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_batch(session, ids):
+            body = orjson.dumps({'ids': ids, 'fields': fieldnames})
+            async with semaphore:
+                async with session.post(fullurl, data=body) as response:
+                    response.raise_for_status()
+                    return orjson.loads(await response.read())
+
+        batches = [recordidlist[i:i + 2000] for i in range(0, len(recordidlist), 2000)]
+        async with aiohttp.ClientSession(headers=headers) as session:
+            results = await asyncio.gather(*[fetch_batch(session, ids) for ids in batches])
+        records = []
+        for batch in results:
+            for item in batch:
+                del item['attributes']
+            records.extend(batch)
+        return records
 
-    #@managed
     def query(self, soql: str) -> Generator:
-        fullurl = f'{self._auth.service_url}/services/data/v{_API_VERSION}/query/'
-        response = self.client.get(fullurl, params={'q': soql})
+        self._ensure_token()
+        response = self.client.get(self._query_url, params={'q': soql}, stream=True)
         response.raise_for_status()
-        txt = response.text
-        if isinstance(txt, str):
-            payload = txt
-        else:
-            payload = str(txt, 'utf-8')
-        data = json.loads(payload)
-        recs = data['records']
-        for rec in recs:
-            yield (rec)
-        while 'nextRecordsUrl' in data:
-            next_records_url = data['nextRecordsUrl']
-            if next_records_url is not None:
-                response = self.client.get('%s%s' % (self._auth.service_url, next_records_url))
-                txt = response.text
-                if isinstance(txt, str):
-                    payload = txt
-                else:
-                    payload = str(txt, 'utf-8')
-                data = json.loads(payload)
-                recs = data['records']
-                for rec in recs:
-                    yield (rec)
-            else:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # hoist the per-page lookups out of the loop; pagination can run
+            # hundreds of iterations on large result sets
+            submit = executor.submit
+            fetch_page = self._fetch_query_page
+            future = None
+            try:
+                while True:
+                    # parse the page as it streams in rather than materializing the
+                    # whole payload - the first record is available almost immediately
+                    # and memory use is bounded by a single record
+                    response.raw.decode_content = True
+                    state = {}
+                    for rec in _iter_query_page(response.raw, state):
+                        if future is None and state.get('nextRecordsUrl'):
+                            # nextRecordsUrl precedes the records in the page body,
+                            # so the next page can download while the caller is
+                            # still consuming this one
+                            future = submit(fetch_page, state['nextRecordsUrl'])
+                        yield rec
+                    response.close()
+                    next_records_url = state.get('nextRecordsUrl')
+                    if not next_records_url:
+                        break
+                    if future is None:
+                        future = submit(fetch_page, next_records_url)
+                    response = future.result()
+                    future = None
+            finally:
+                # an abandoned generator (query_one, early break) lands here
+                # mid-page: return the current connection to the pool and deal
+                # with any prefetch still in flight
+                response.close()
+                if future is not None and not future.cancel():
+                    try:
+                        future.result().close()
+                    except Exception:
+                        # the prefetch failed; nothing to release
+                        pass
+
+    def _fetch_query_page(self, next_records_url: str):
+        response = self.client.get(self._auth.service_url + next_records_url, stream=True)
+        response.raise_for_status()
+        return response
+
+    def query_arrow(self, soql: str):
+        """
+        Execute a query and return the whole result set as a pyarrow.Table.
+
+        Intended for DataFrame/Parquet export pipelines: records stream out
+        of query() and are re-emitted as newline-delimited JSON for Arrow's
+        native reader, which builds column arrays directly instead of leaving
+        a dict per row for pandas to unbox later. Requires the optional
+        pyarrow package.
+
+        :param soql: SOQL statement
+        :return: pyarrow.Table of all records, one column per field
+        """
+        if _pyarrow_json is None:
+            raise SFError('query_arrow requires the pyarrow package to be installed')
+        buf = io.BytesIO()
+        write = buf.write
+        for rec in self.query(soql):
+            rec.pop('attributes', None)
+            write(orjson.dumps(rec))
+            write(b'\n')
+        buf.seek(0)
+        return _pyarrow_json.read_json(buf)
+
+    async def aquery(self, soql: str):
+        """
+        Async version of query() - an async generator over the query results.
+
+        Lets an event loop keep many SOQL queries in flight on a single
+        thread, with pagination overlapping whatever the caller does between
+        records. Requires the optional aiohttp package.
+
+        :param soql: SOQL statement
+        :return: async generator of records as Dicts
+        """
+        if aiohttp is None:
+            raise SFError('aquery requires the aiohttp package to be installed')
+        headers = {'Authorization': 'OAuth ' + self._auth.access_token,
+                   'Content-Type': 'application/json; charset=UTF-8'}
+        async with aiohttp.ClientSession(headers=headers) as session:
+            data = await self._afetch_page(session, self._query_url, {'q': soql})
+            task = None
+            try:
+                while True:
+                    next_records_url = data.get('nextRecordsUrl')
+                    if next_records_url:
+                        # start the next page download before yielding this one so
+                        # the network wait overlaps the caller's processing
+                        task = asyncio.ensure_future(
+                            self._afetch_page(session, self._auth.service_url + next_records_url))
+                    for rec in data['records']:
+                        yield rec
+                    if task is None:
+                        break
+                    data = await task
+                    task = None
+            finally:
+                # a consumer that stops early leaves the prefetch task running;
+                # cancel and retire it before the session closes underneath it
+                if task is not None:
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+                    except Exception:
+                        pass
+
+    @staticmethod
+    async def _afetch_page(session, url: str, params: Dict = None) -> Dict:
+        async with session.get(url, params=params) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())
+
+    def query_bulk(self, soql: str, poll_interval: float = 5.0) -> Generator:
+        """
+        Execute a query using the Bulk API 2.0 - suited to very large extracts.
+
+        Submits a query job, polls until Salesforce finishes it server-side,
+        then streams back the CSV result chunks. The bulk endpoint returns
+        results in far larger batches than the REST query endpoint, so big
+        result sets need far fewer round-trips.
+
+        :param soql: SOQL statement
+        :param poll_interval: seconds to wait between job status polls
+        :return: generator of records as Dicts (values are strings, per CSV)
+        """
+        job = self._http_post(self._base_url + '/jobs/query', {'operation': 'query', 'query': soql})
+        job_id = job['id']
+        while True:
+            status = self._http_get(f'jobs/query/{job_id}', {})
+            state = status['state']
+            if state == 'JobComplete':
+                break
+            if state in ('Aborted', 'Failed'):
+                raise SFError(status.get('errorMessage') or f'bulk query job {job_id} {state.lower()}')
+            time.sleep(poll_interval)
+        locator = None
+        while True:
+            params = {'locator': locator} if locator else {}
+            response = self.client.get(f'{self._base_url}/jobs/query/{job_id}/results', params=params,
+                                       headers={'Accept': 'text/csv'})
+            response.raise_for_status()
+            for row in csv.DictReader(io.StringIO(response.text)):
+                yield row
+            locator = response.headers.get('Sforce-Locator')
+            if not locator or locator == 'null':
                 break
 
     def query_one(self, soql: str) -> Optional[Dict]:
         """
         Execute a query and return a single record
 
+        A 'limit 1' clause is added when the statement has none, so the
+        server returns one record rather than a full first page that would
+        be thrown away.
+
         :param soql: SOQL statement
         :return: first record found, or None
         """
-        for rec in self.query(soql):
-            return rec
-        return None
+        if not _LIMIT_CLAUSE.search(soql):
+            offset = _OFFSET_CLAUSE.search(soql)
+            if offset:
+                # SOQL grammar puts LIMIT ahead of OFFSET
+                soql = soql[:offset.start()] + 'limit 1 ' + soql[offset.start():]
+            else:
+                soql = soql.rstrip().rstrip(';') + ' limit 1'
+        return next(self.query(soql), None)
+
+    def query_all(self, soql: str) -> List[Dict]:
+        """
+        Execute a query and return every record as a single list.
+
+        For callers that materialize the result anyway (list(...), DataFrame
+        loads), this skips query()'s per-record generator bounce: each page
+        is decoded in one shot and extended into the result. Prefer query()
+        when results are processed incrementally or may not be consumed
+        fully.
+
+        :param soql: SOQL statement
+        :return: list of all records as Dicts
+        """
+        self._ensure_token()
+        response = self.client.get(self._query_url, params={'q': soql})
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        records = data['records']
+        svc = self._auth.service_url
+        while data.get('nextRecordsUrl'):
+            response = self.client.get(svc + data['nextRecordsUrl'])
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            records.extend(data['records'])
+        return records
 
-    #@managed
     def call(self, urn: str) -> str:
         """call a custom REST endpoint
 
@@ -330,6 +599,7 @@ class SFClient:
             raise ValueError("urn parameter is not valid")
         if urn[0] == '/':
             urn = urn[1:]
+        self._ensure_token()
         fullurl = f'{self.service_url}/{urn}'
         response = self.client.get(fullurl)
         return response.text
@@ -339,6 +609,7 @@ class SFClient:
             raise ValueError("urn parameter is not valid")
         if urn[0] == '/':
             urn = urn[1:]
+        self._ensure_token()
         fullurl = f'{self.service_url}/{urn}'
         response = self.client.delete(fullurl)
         return response.text
@@ -350,66 +621,54 @@ class SFClient:
     ##
     # REST API wrappers
     ##
-    #@managed
     def _http_post(self, fullurl: str, payload):
-        if isinstance(payload, Dict):
-            payload = json.dumps(payload)
-        try:
-            # self.logger.debug('post %s', fullurl)
-            response = self.client.post(fullurl, data=payload)
-            #response.raise_for_status()
-        except Exception as ex:
-            self.logger.error(ex)
-            raise ex
-        if 'errorCode' in response.text:
+        self._ensure_token()
+        # orjson emits bytes, which go to the socket as-is; a str body would
+        # cost requests another utf-8 encode pass on the way out
+        body = payload if isinstance(payload, (bytes, bytearray)) else orjson.dumps(payload)
+        response = self.client.post(fullurl, data=body)
+        if response.status_code >= 400:
+            # only failures pay for decoding the body into a log message;
+            # the success path never materializes response.text at all
             self.logger.error('response: %s', response.text)
-        data = json.loads(response.text)
-        return data
+            raise SFError(response.text)
+        return orjson.loads(response.content)
 
-    #@managed
     def _http_patch(self, fullurl: str, payload):
-        if isinstance(payload, Dict):
-            payload = json.dumps(payload)
-        try:
-            # self.logger.debug('post %s', fullurl)
-            response = self.client.patch(fullurl, data=payload)
-            #response.raise_for_status()
-        except Exception as ex:
-            self.logger.error(ex)
-            raise ex
-        if 'errorCode' in response.text:
+        self._ensure_token()
+        body = payload if isinstance(payload, (bytes, bytearray)) else orjson.dumps(payload)
+        response = self.client.patch(fullurl, data=body)
+        if response.status_code >= 400:
             self.logger.error('response: %s', response.text)
-        data = json.loads(response.text)
-        return data
+            raise SFError(response.text)
+        # the single-record update resource answers 204 No Content; only the
+        # composite endpoints send a body back
+        return orjson.loads(response.content) if response.content else None
 
-    #@managed
     def _http_get(self, resource, url_params):
-        full_url = f'{self._auth.service_url}/services/data/v{_API_VERSION}/{resource}'
+        self._ensure_token()
+        full_url = f'{self._base_url}/{resource}'
         response = self.client.get(full_url, params=url_params)
         if response.status_code == 404:
             return None
-        result_payload = response.text
         response.raise_for_status()
-        data = json.loads(result_payload)
+        data = orjson.loads(response.content)
         return data
 
     ##
     # Helpers
     ##
 
-    #@managed
     def record_count(self, sobject_name: str, where_filter: str = None):
         """Returns the number of records in a table, possibly filtered
 
         :param where_filter: optional WHERE clause criteria for filtering the count
         :param sobject_name: name of the sobject to count
         """
-        soql = 'select count() from ' + sobject_name
-        if where_filter:
-            soql += ' where ' + where_filter
-        fullurl = f'{self._auth.service_url}/services/data/v{_API_VERSION}/query/'
-        response = self.client.get(fullurl, params={'q': soql})
+        soql = f'select count() from {sobject_name}' + (f' where {where_filter}' if where_filter else '')
+        self._ensure_token()
+        response = self.client.get(self._query_url, params={'q': soql})
         response.raise_for_status()
-        result = response.json()
-        #return result['totalSize']
+        result = orjson.loads(response.content)
+        return result['totalSize']
 